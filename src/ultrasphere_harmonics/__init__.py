@@ -1,24 +1,55 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 __version__ = "1.3.0"
-from ._core import (
-    Phase,
-    assume_n_end_and_include_negative_m_from_harmonics,
-    concat_harmonics,
-    expand_dims_harmonics,
-    flatten_harmonics,
-    harmonics,
-    index_array_harmonics,
-    index_array_harmonics_all,
-)
-from ._cut import expand_cut
-from ._expansion import expand, expand_evaluate
-from ._helmholtz import harmonics_regular_singular, harmonics_regular_singular_component
-from ._ndim import (
-    harm_n_ndim_eq,
-    harm_n_ndim_le,
-    homogeneous_ndim_eq,
-    homogeneous_ndim_le,
-)
-from ._translation import harmonics_translation_coef, harmonics_twins_expansion
+
+if TYPE_CHECKING:
+    from ._core import (
+        Phase,
+        assume_n_end_and_include_negative_m_from_harmonics,
+        concat_harmonics,
+        expand_dims_harmonics,
+        flatten_harmonics,
+        harmonics,
+        index_array_harmonics,
+        index_array_harmonics_all,
+    )
+    from ._cut import expand_cut
+    from ._expansion import expand, expand_evaluate
+    from ._helmholtz import (
+        harmonics_regular_singular,
+        harmonics_regular_singular_component,
+    )
+    from ._ndim import (
+        harm_n_ndim_eq,
+        harm_n_ndim_le,
+        homogeneous_ndim_eq,
+        homogeneous_ndim_le,
+    )
+    from ._translation import harmonics_translation_coef, harmonics_twins_expansion
+
+# submodules are imported on first access (PEP 562)
+_LAZY = {
+    "Phase": "._core",
+    "assume_n_end_and_include_negative_m_from_harmonics": "._core",
+    "concat_harmonics": "._core",
+    "expand_dims_harmonics": "._core",
+    "flatten_harmonics": "._core",
+    "harmonics": "._core",
+    "index_array_harmonics": "._core",
+    "index_array_harmonics_all": "._core",
+    "expand_cut": "._cut",
+    "expand": "._expansion",
+    "expand_evaluate": "._expansion",
+    "harmonics_regular_singular": "._helmholtz",
+    "harmonics_regular_singular_component": "._helmholtz",
+    "harm_n_ndim_eq": "._ndim",
+    "harm_n_ndim_le": "._ndim",
+    "homogeneous_ndim_eq": "._ndim",
+    "homogeneous_ndim_le": "._ndim",
+    "harmonics_translation_coef": "._translation",
+    "harmonics_twins_expansion": "._translation",
+}
 
 __all__ = [
     "Phase",
@@ -41,3 +72,15 @@ __all__ = [
     "index_array_harmonics",
     "index_array_harmonics_all",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        value = getattr(import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return [*__all__, "__version__"]
@@ -1,4 +1,6 @@
+from bisect import bisect_left
 from collections.abc import Mapping
+from functools import cache
 
 from array_api._2024_12 import Array
 from ultrasphere import SphericalCoordinates
@@ -6,6 +8,67 @@ from ultrasphere import SphericalCoordinates
 from .._ndim import harm_n_ndim_le
 
 
+@cache
+def _harm_n_ndim_le_table(c_ndim: int, n_end_max: int) -> tuple[int, ...]:
+    """
+    The number of harmonics of degree below n_end for n_end in [0, n_end_max].
+
+    Parameters
+    ----------
+    c_ndim : int
+        The dimension of the Cartesian space.
+    n_end_max : int
+        The maximum n_end to tabulate.
+
+    Returns
+    -------
+    tuple[int, ...]
+        The monotonically non-decreasing sizes, indexed by n_end.
+
+    """
+    return tuple(
+        int(harm_n_ndim_le(n_end, c_ndim=c_ndim)) for n_end in range(n_end_max + 1)
+    )
+
+
+@cache
+def _n_end_from_size(c_ndim: int, size: int) -> int:
+    """
+    The n_end such that the number of harmonics of degree below n_end is size.
+
+    Parameters
+    ----------
+    c_ndim : int
+        The dimension of the Cartesian space.
+    size : int
+        The size of the flattened harmonics.
+
+    Returns
+    -------
+    int
+        The smallest n_end matching the size.
+
+    Raises
+    ------
+    ValueError
+        If no n_end corresponds to the size.
+
+    """
+    n_end_max = 1
+    while True:
+        sizes = _harm_n_ndim_le_table(c_ndim, n_end_max)
+        # the sizes saturate for c_ndim <= 1, so stop growing the table
+        if sizes[-1] >= size or sizes[-1] == sizes[-2]:
+            break
+        n_end_max *= 2
+    n_end = bisect_left(sizes, size)
+    if n_end >= len(sizes) or sizes[n_end] != size:
+        raise ValueError(
+            f"The size of the last axis {size=} does not correspond to any n_end."
+        )
+    return n_end
+
+
 def assume_n_end_and_include_negative_m_from_harmonics[TCartesian, TSpherical](
     c: SphericalCoordinates[TSpherical, TCartesian],
     expansion: Mapping[TSpherical, Array] | Array | tuple[int, ...],
@@ -52,18 +115,7 @@ def assume_n_end_and_include_negative_m_from_harmonics[TCartesian, TSpherical](
             raise NotImplementedError()
         if isinstance(expansion, tuple):
             raise NotImplementedError()
-        size = expansion.shape[-1]
-        n_end = 0
-        while True:
-            size_current = harm_n_ndim_le(n_end, c_ndim=c.c_ndim)
-            if size_current == size:
-                return n_end, True
-            elif size_current > size:
-                raise ValueError(
-                    f"The size of the last axis {size=} "
-                    "does not correspond to any n_end."
-                )
-            n_end += 1
+        return _n_end_from_size(c.c_ndim, int(expansion.shape[-1])), True
     else:
         if c.s_ndim == 0:
             return 0, False
@@ -0,0 +1,74 @@
+# The caches (functools.cache / lru_cache) in this package only hold
+# Python values and read-only host-side NumPy arrays,
+# never arrays of the caller's namespace, which would keep device memory
+# alive and could capture traced values (e.g. under jax.jit).
+# Cached arrays are converted with `from_host` on every call.
+#
+# Only NumPy avoids the per-call allocations this way.
+# For the other namespaces the caches save recomputing the tables,
+# but `from_host` still copies each table from the host on every call.
+# The tables are small compared to the harmonics they are used for:
+# one flattened `harmonics` call converts 5 tables (2.6 kB at n_end=10,
+# 22 kB at n_end=30) for create_spherical() and 11 tables (42 kB, 2.5 MB)
+# for create_standard(4), and copying them on the host takes
+# 2-110 us, under 0.4% of the call. On a GPU, each table instead
+# costs one host-to-device transfer per call, which was not measured.
+from typing import Any
+
+import numpy as np
+from array_api._2024_12 import Array, ArrayNamespaceFull
+from array_api_compat import is_numpy_namespace
+
+
+def readonly(array: np.ndarray, /) -> np.ndarray:
+    """
+    Mark a host-side array to be cached as read-only.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        The array.
+
+    Returns
+    -------
+    np.ndarray
+        The same array, which can no longer be modified in place.
+
+    """
+    array.flags.writeable = False
+    return array
+
+
+def from_host(
+    xp: ArrayNamespaceFull,
+    array: np.ndarray,
+    /,
+    *,
+    dtype: Any | None = None,
+    device: Any | None = None,
+) -> Array:
+    """
+    Convert a cached host-side array to the namespace.
+
+    Parameters
+    ----------
+    xp : ArrayNamespaceFull
+        The array namespace.
+    array : np.ndarray
+        The read-only host-side array.
+    dtype : Any | None, optional
+        The dtype, by default None
+    device : Any | None, optional
+        The device, by default None
+
+    Returns
+    -------
+    Array
+        The array in the namespace.
+        For NumPy this may be the cached array itself, which stays read-only.
+        Otherwise it is a copy owned by the caller.
+
+    """
+    if is_numpy_namespace(xp):
+        return xp.asarray(array, dtype=dtype, device=device)
+    return xp.asarray(array, dtype=dtype, device=device, copy=True)
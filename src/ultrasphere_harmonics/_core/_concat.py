@@ -1,9 +1,37 @@
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 
 from array_api._2024_12 import Array
 from array_api_compat import array_namespace
 from ultrasphere import SphericalCoordinates
 
+from ._flatten import _flatten_index_harmonics
+from ._inplace import multiply_into
+
+
+def _multiply_factors(factors: Sequence[Array], /) -> Array:
+    """
+    Multiply the broadcastable factors together.
+
+    Parameters
+    ----------
+    factors : Sequence[Array]
+        The non-empty sequence of factors.
+
+    Returns
+    -------
+    Array
+        The product of the factors.
+
+    """
+    # multiplication broadcasts, so there is no need to
+    # stack the broadcasted arrays before reducing
+    result = factors[0]
+    for i, factor in enumerate(factors[1:]):
+        # the first product is a fresh buffer which later factors
+        # can be accumulated into
+        result = result * factor if i == 0 else multiply_into(result, factor)
+    return result
+
 
 def concat_harmonics[TSpherical, TCartesian](
     c: SphericalCoordinates[TSpherical, TCartesian],
@@ -46,15 +74,82 @@ def concat_harmonics[TSpherical, TCartesian](
            [0.43+0.j  , 0.09+0.14j, 0.09-0.14j]])
 
     """
-    xp = array_namespace(*[harmonics[k] for k in c.s_nodes])
+    factors = [harmonics[k] for k in c.s_nodes]
+    xp = array_namespace(*factors)
     try:
         if c.s_ndim == 0:
             return xp.asarray(1)
-        return xp.prod(
-            xp.stack(xp.broadcast_arrays(*[harmonics[k] for k in c.s_nodes]), axis=0),
-            axis=0,
-        )
+        if len(factors) == 1:
+            # do not hand the caller's array back, it may be modified in place
+            return xp.asarray(factors[0], copy=True)
+        return _multiply_factors(factors)
     except Exception as e:
         shapes = {k: v.shape for k, v in harmonics.items()}
         e.add_note(f"Harmonics shapes: {shapes}")
         raise
+
+
+def _concat_flatten_harmonics[TSpherical, TCartesian](
+    c: SphericalCoordinates[TSpherical, TCartesian],
+    harmonics: Mapping[TSpherical, Array],
+    *,
+    n_end: int,
+    include_negative_m: bool,
+) -> Array:
+    """
+    Concatenate and flatten the mapping of expanded harmonics.
+
+    Equivalent to `flatten_harmonics(c, concat_harmonics(c, harmonics))`,
+    but only the valid combinations of the quantum numbers
+    are gathered from each factor before multiplying,
+    so the full (n_1, ..., n_(c.s_ndim)) product is never built.
+
+    Parameters
+    ----------
+    c : SphericalCoordinates[TSpherical, TCartesian]
+        The spherical coordinates.
+    harmonics : Mapping[TSpherical, Array]
+        The expanded harmonics.
+    n_end : int
+        The maximum degree of the harmonic.
+    include_negative_m : bool
+        Whether to include negative m values.
+
+    Returns
+    -------
+    Array
+        The flattened harmonics of shape (..., n_harmonics).
+
+    Raises
+    ------
+    ValueError
+        If c has no spherical nodes.
+
+    """
+    if c.s_ndim == 0:
+        raise ValueError(
+            "Cannot flatten the harmonics of spherical coordinates "
+            "without spherical nodes."
+        )
+    factors = [harmonics[k] for k in c.s_nodes]
+    xp = array_namespace(*factors)
+    device = factors[0].device
+    index = _flatten_index_harmonics(c, n_end, xp, include_negative_m, device)
+    # singleton (expanded) axes are indexed with zeros
+    zeros = xp.zeros_like(index[0])
+    return _multiply_factors(
+        [
+            factor[
+                (
+                    ...,
+                    *(
+                        i if size != 1 else zeros
+                        for i, size in zip(
+                            index, factor.shape[factor.ndim - c.s_ndim :], strict=True
+                        )
+                    ),
+                )
+            ]
+            for factor in factors
+        ]
+    )
@@ -1,13 +1,24 @@
+import math
 from enum import STRICT, Flag, auto
+from functools import cache, lru_cache
 
 import numpy as np
 from array_api._2024_12 import Array
 from array_api_compat import array_namespace
 from array_api_negative_index import to_symmetric
-from jacobi_poly import jacobi_all, jacobi_normalization_constant
+from jacobi_poly import (
+    jacobi_all,
+    jacobi_normalization_constant,
+    log_jacobi_normalization_constant,
+)
 from shift_nth_row_n_steps import shift_nth_row_n_steps
 from ultrasphere import BranchingType, SphericalCoordinates
 
+from ._cache import from_host, readonly
+from ._inplace import multiply_into
+
+_INV_SQRT_2PI = 1 / math.sqrt(2 * math.pi)
+
 
 class Phase(Flag, boundary=STRICT):
     """Adjust phase (±) of the spherical harmonics, mainly to match conventions."""
@@ -34,12 +45,15 @@ class Phase(Flag, boundary=STRICT):
     @classmethod
     def all(cls) -> list["Phase"]:
         """Return all possible combinations of the Phase flags."""
-        return [
-            cls(0),
-            cls.CONDON_SHORTLEY,
-            cls.NEGATIVE_LEGENDRE,
-            cls.CONDON_SHORTLEY | cls.NEGATIVE_LEGENDRE,
-        ]
+        return list(_PHASE_ALL)
+
+
+_PHASE_ALL = (
+    Phase(0),
+    Phase.CONDON_SHORTLEY,
+    Phase.NEGATIVE_LEGENDRE,
+    Phase.CONDON_SHORTLEY | Phase.NEGATIVE_LEGENDRE,
+)
 
 
 def minus_1_power(x: Array, /) -> Array:
@@ -57,9 +71,268 @@ def minus_1_power(x: Array, /) -> Array:
         $(-1)^x$
 
     """
+    xp = array_namespace(x)
+    if xp.isdtype(x.dtype, "integral"):
+        # the lowest bit is the parity, also for negative integers
+        return 1 - ((x & 1) << 1)
     return 1 - 2 * (x % 2)
 
 
+@cache
+def _phase_sign(
+    phase: Phase, n_end: int, include_negative_m: bool, /
+) -> tuple[int, ...]:
+    """
+    The ±1 factor of the type a eigenfunction for each m.
+
+    Parameters
+    ----------
+    phase : Phase
+        Adjust phase (±) of the spherical harmonics, mainly to match conventions.
+    n_end : int
+        The maximum degree of the harmonic.
+    include_negative_m : bool
+        Whether to include negative m values.
+
+    Returns
+    -------
+    tuple[int, ...]
+        The signs in the same order of m as `type_a`.
+
+    """
+    ms = list(range(n_end))
+    if include_negative_m:
+        ms += list(range(-n_end + 1, 0))
+    if Phase.CONDON_SHORTLEY in phase:
+        if Phase.NEGATIVE_LEGENDRE in phase:
+            exponents = [(abs(m) + m) // 2 for m in ms]
+        else:
+            exponents = ms
+    elif Phase.NEGATIVE_LEGENDRE in phase:
+        exponents = [(abs(m) - m) // 2 for m in ms]
+    else:
+        exponents = [0] * len(ms)
+    return tuple(1 - 2 * (e % 2) for e in exponents)
+
+
+@cache
+def _type_a_scale(phase: Phase, n_end: int, include_negative_m: bool, /) -> np.ndarray:
+    r"""
+    Cached $\pm 1 / \sqrt{2\pi}$ factor of the type a eigenfunction for each m.
+
+    Parameters
+    ----------
+    phase : Phase
+        Adjust phase (±) of the spherical harmonics, mainly to match conventions.
+    n_end : int
+        The maximum degree of the harmonic.
+    include_negative_m : bool
+        Whether to include negative m values.
+
+    Returns
+    -------
+    np.ndarray
+        The factors in the same order of m as `type_a`.
+
+    """
+    return readonly(
+        np.asarray(_phase_sign(phase, n_end, include_negative_m)) * _INV_SQRT_2PI
+    )
+
+
+@lru_cache(maxsize=256)
+def _index_ladder(n_end: int, /) -> np.ndarray:
+    """
+    The degrees 0, ..., n_end - 1 shared by the index ladders of the eigenfunctions.
+
+    Parameters
+    ----------
+    n_end : int
+        The maximum degree of the harmonic.
+
+    Returns
+    -------
+    np.ndarray
+        The degrees of shape (n_end,).
+
+    """
+    return readonly(np.arange(n_end, dtype=np.float64))
+
+
+@lru_cache(maxsize=256)
+def _type_c_gather_index(n_end: int, /) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The index to gather [l_alpha, l_beta, l] from [l_alpha, l_beta, n] in type c.
+
+    Parameters
+    ----------
+    n_end : int
+        The maximum degree of the harmonic.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        The index of n clipped to the valid range,
+        whether l - l_alpha - l_beta is even,
+        and whether l - l_alpha - l_beta is non-negative,
+        each of shape (n_end, n_end, n_end).
+
+    """
+    l = np.arange(n_end)
+    diff = l[None, None, :] - l[:, None, None] - l[None, :, None]
+    index = np.clip(diff // 2, 0, max((n_end + 1) // 2 - 1, 0))
+    return readonly(index), readonly(diff % 2 == 0), readonly(diff >= 0)
+
+
+@lru_cache(maxsize=256)
+def _type_b_normalization(n_end: int, s: int, /) -> np.ndarray:
+    r"""
+    Cached normalization constant of the type b (and b') eigenfunction.
+
+    Parameters
+    ----------
+    n_end : int
+        The maximum degree of the harmonic.
+    s : int
+        The number of non-leaf child nodes of the child node.
+
+    Returns
+    -------
+    np.ndarray
+        $N^{(\alpha,\alpha)}_n$ of shape (n_end, n_end) indexed by [l_child, n].
+
+    """
+    l = np.arange(n_end, dtype=np.float64)
+    alpha = l[:, None] + s / 2
+    return readonly(
+        np.asarray(jacobi_normalization_constant(alpha=alpha, beta=alpha, n=l[None, :]))
+    )
+
+
+@lru_cache(maxsize=256)
+def _type_c_normalization(n_end: int, s_alpha: int, s_beta: int, /) -> np.ndarray:
+    r"""
+    Cached normalization constant of the type c eigenfunction.
+
+    Parameters
+    ----------
+    n_end : int
+        The maximum degree of the harmonic.
+    s_alpha : int
+        The number of non-leaf child nodes of the node alpha.
+    s_beta : int
+        The number of non-leaf child nodes of the node beta.
+
+    Returns
+    -------
+    np.ndarray
+        The constant including the $2^{(\alpha + \beta) / 2 + 1}$ factor
+        of shape (n_end, n_end, (n_end + 1) // 2)
+        indexed by [l_alpha, l_beta, n].
+
+    """
+    l = np.arange(n_end, dtype=np.float64)
+    alpha = l[:, None] + s_alpha / 2
+    beta = l[None, :] + s_beta / 2
+    return readonly(
+        np.asarray(
+            _type_c_normalization_from(
+                alpha, beta, np.arange((n_end + 1) // 2, dtype=np.float64)
+            )
+        )
+    )
+
+
+def _type_c_normalization_from(alpha: Array, beta: Array, n: Array, /) -> Array:
+    r"""
+    Normalization constant of the type c eigenfunction.
+
+    Parameters
+    ----------
+    alpha : Array
+        $l_\alpha + s_\alpha / 2$ of shape (..., n_end, 1).
+    beta : Array
+        $l_\beta + s_\beta / 2$ of shape (..., 1, n_end).
+    n : Array
+        The degree of the Jacobi polynomial,
+        broadcastable to (..., n_end, n_end, (n_end + 1) // 2).
+
+    Returns
+    -------
+    Array
+        The constant including the $2^{(\alpha + \beta) / 2 + 1}$ factor
+        of shape (..., n_end, n_end, (n_end + 1) // 2).
+        jacobi_poly computes it in float64 (np.log(2)),
+        so it should be cast before multiplying.
+
+    """
+    xp = array_namespace(alpha, beta, n)
+    # 2^((alpha + beta) / 2 + 1) is folded into the normalization in log space
+    return xp.exp(
+        log_jacobi_normalization_constant(
+            alpha=alpha[..., None], beta=beta[..., None], n=n
+        )
+        + ((alpha + beta) / 2 + 1)[..., None] * math.log(2)
+    )
+
+
+def _flatten_batch(theta: Array, *s: Array) -> tuple[tuple[int, ...], list[Array]]:
+    """
+    Flatten the batch dimensions of theta (and s if not scalar) to 1-D.
+
+    Scalar s are kept as is so that the normalization constants
+    are not computed for each element of the batch.
+
+    Parameters
+    ----------
+    theta : Array
+        The angles.
+    *s : Array
+        The number of non-leaf child nodes.
+
+    Returns
+    -------
+    tuple[tuple[int, ...], list[Array]]
+        The broadcasted batch shape and the flattened [theta, *s].
+
+    """
+    xp = array_namespace(theta, *s)
+    shape = xp.broadcast_arrays(theta, *s)[0].shape
+    return shape, [
+        a
+        if a is not theta and a.ndim == 0
+        else xp.reshape(xp.broadcast_to(a, shape), (-1,))
+        for a in (theta, *s)
+    ]
+
+
+def _power_ladder(x: Array, n_end: int, /) -> Array:
+    """
+    $x^l$ for $l = 0, 1, ..., n_end - 1$.
+
+    Computed by cumulative product instead of calling pow for each l.
+
+    Parameters
+    ----------
+    x : Array
+        The base.
+    n_end : int
+        The number of powers.
+
+    Returns
+    -------
+    Array
+        The powers of shape (..., n_end).
+
+    """
+    xp = array_namespace(x)
+    return xp.cumulative_prod(
+        xp.broadcast_to(x[..., None], (*x.shape, max(n_end - 1, 0))),
+        axis=-1,
+        include_initial=True,
+    )[..., :n_end]
+
+
 def type_a(
     theta: Array,
     n_end: int,
@@ -103,34 +376,25 @@ def type_a(
 
     """
     xp = array_namespace(theta)
-    m = xp.arange(0, n_end, dtype=theta.dtype, device=theta.device)[
-        (None,) * (theta.ndim) + (slice(None),)
-    ]
+    dtype = xp.complex64 if theta.dtype in [xp.complex64, xp.float32] else xp.complex128
+    # e^{i m theta} = (e^{i theta})^m needs only one cos and sin per theta
+    cos, sin = xp.astype(xp.cos(theta), dtype), xp.astype(xp.sin(theta), dtype)
+    res = _power_ladder(cos + 1j * sin, n_end)
     if include_negative_m:
-        m = to_symmetric(m, axis=-1, asymmetric=True, conjugate=False)
-    res = xp.exp(
-        xp.asarray(
-            1j,
-            dtype=(
-                xp.complex64
-                if theta.dtype in [xp.complex64, xp.float32]
-                else xp.complex128
-            ),
-            device=theta.device,
-        )
-        * m
-        * theta[..., None]
-    ) / np.sqrt(2 * np.pi)
-    phase = Phase(phase)
-    if Phase.CONDON_SHORTLEY in phase:
-        if Phase.NEGATIVE_LEGENDRE in phase:
-            res *= minus_1_power((xp.abs(m) + m) // 2)
+        if xp.isdtype(theta.dtype, "complex floating"):
+            # e^{-i m theta} is not the conjugate of e^{i m theta} for complex theta
+            res_negative = _power_ladder(cos - 1j * sin, n_end)[..., 1:]
+            res = xp.concat([res, xp.flip(res_negative, axis=-1)], axis=-1)
         else:
-            res *= minus_1_power(m)
-    else:
-        if Phase.NEGATIVE_LEGENDRE in phase:
-            res *= minus_1_power((xp.abs(m) - m) // 2)
-    return res
+            # e^{-i m theta} is the conjugate of e^{i m theta} for real theta
+            res = to_symmetric(res, axis=-1, conjugate=True)
+    # the phase signs and the normalization are applied in a single pass
+    return res * from_host(
+        xp,
+        _type_a_scale(Phase(phase), n_end, include_negative_m),
+        dtype=dtype,
+        device=theta.device,
+    )
 
 
 def type_b(
@@ -185,23 +449,37 @@ def type_b(
 
     """
     xp = array_namespace(theta)
+    normalization = None
     if isinstance(s_beta, int):
+        normalization = from_host(
+            xp,
+            _type_b_normalization(n_end, s_beta),
+            dtype=theta.dtype,
+            device=theta.device,
+        )
         s_beta = xp.asarray(s_beta, dtype=theta.dtype, device=theta.device)
+    # evaluate on a contiguous 1-D batch and restore the shape at the end
+    shape, (theta, s_beta) = _flatten_batch(theta, s_beta)
     # using broadcasting may cause problems, we have to be very careful here
-    l_beta = xp.arange(0, n_end, dtype=theta.dtype, device=theta.device)[
-        (None,) * (theta.ndim) + (slice(None),)
-    ]
-    n = xp.arange(0, n_end, dtype=theta.dtype, device=theta.device)[
-        (None,) * (theta.ndim) + (None, slice(None))
-    ]
+    # a single conversion, the ladders below are views of it
+    ladder = from_host(xp, _index_ladder(n_end), dtype=theta.dtype, device=theta.device)
+    l_beta = ladder[(None,) * (theta.ndim) + (slice(None),)]
     alpha = l_beta + s_beta[..., None] / 2
-    res = (
-        jacobi_normalization_constant(
-            alpha=alpha[..., None], beta=alpha[..., None], n=n
+    # jacobi_all returns a fresh buffer of the full shape,
+    # so the other factors can be multiplied into it
+    res = jacobi_all(n_end=n_end, alpha=alpha, beta=alpha, x=xp.cos(theta[..., None]))
+    if normalization is None:
+        n = ladder[(None,) * (theta.ndim) + (None, slice(None))]
+        # jacobi_poly computes the constant in float64 (np.log(2)),
+        # cast it so that the full-size multiply stays in the input precision
+        normalization = xp.astype(
+            jacobi_normalization_constant(
+                alpha=alpha[..., None], beta=alpha[..., None], n=n
+            ),
+            res.dtype,
         )
-        * (xp.sin(theta[..., None, None]) ** l_beta[..., None])
-        * jacobi_all(n_end=n_end, alpha=alpha, beta=alpha, x=xp.cos(theta[..., None]))
-    )
+    res = multiply_into(res, normalization)
+    res = multiply_into(res, _power_ladder(xp.sin(theta), n_end)[..., None])
     if not index_with_surrogate_quantum_number:
         # [l_beta, n] -> [l_beta, l = n + l_beta]
         res = shift_nth_row_n_steps(
@@ -213,7 +491,7 @@ def type_b(
         )
     if is_beta_type_a_and_include_negative_m:
         res = to_symmetric(res, axis=-2, asymmetric=False, conjugate=False)
-    return res
+    return xp.reshape(res, (*shape, *res.shape[1:]))
 
 
 def type_bdash(
@@ -268,20 +546,30 @@ def type_bdash(
 
     """
     xp = array_namespace(theta)
+    normalization = None
     if isinstance(s_alpha, int):
+        normalization = from_host(
+            xp,
+            _type_b_normalization(n_end, s_alpha),
+            dtype=theta.dtype,
+            device=theta.device,
+        )
         s_alpha = xp.asarray(s_alpha, dtype=theta.dtype, device=theta.device)
-    l_alpha = xp.arange(0, n_end, dtype=theta.dtype, device=theta.device)[
-        (None,) * (theta.ndim) + (slice(None),)
-    ]
-    n = xp.arange(0, n_end, dtype=theta.dtype, device=theta.device)[
-        (None,) * (theta.ndim) + (None, slice(None))
-    ]
+    shape, (theta, s_alpha) = _flatten_batch(theta, s_alpha)
+    ladder = from_host(xp, _index_ladder(n_end), dtype=theta.dtype, device=theta.device)
+    l_alpha = ladder[(None,) * (theta.ndim) + (slice(None),)]
     beta = l_alpha + s_alpha[..., None] / 2
-    res = (
-        jacobi_normalization_constant(alpha=beta[..., None], beta=beta[..., None], n=n)
-        * (xp.cos(theta[..., None, None]) ** l_alpha[..., None])
-        * jacobi_all(n_end=n_end, alpha=beta, beta=beta, x=xp.sin(theta[..., None]))
-    )
+    res = jacobi_all(n_end=n_end, alpha=beta, beta=beta, x=xp.sin(theta[..., None]))
+    if normalization is None:
+        n = ladder[(None,) * (theta.ndim) + (None, slice(None))]
+        normalization = xp.astype(
+            jacobi_normalization_constant(
+                alpha=beta[..., None], beta=beta[..., None], n=n
+            ),
+            res.dtype,
+        )
+    res = multiply_into(res, normalization)
+    res = multiply_into(res, _power_ladder(xp.cos(theta), n_end)[..., None])
     if not index_with_surrogate_quantum_number:
         res = shift_nth_row_n_steps(
             res,
@@ -293,7 +581,7 @@ def type_bdash(
     # [l_alpha, n] -> [l_alpha, l = n + l_alpha]
     if is_alpha_type_a_and_include_negative_m:
         res = to_symmetric(res, axis=-2, asymmetric=False, conjugate=False)
-    return res
+    return xp.reshape(res, (*shape, *res.shape[1:]))
 
 
 def type_c(
@@ -355,70 +643,60 @@ def type_c(
 
     """
     xp = array_namespace(theta)
+    normalization = None
+    if isinstance(s_alpha, int) and isinstance(s_beta, int):
+        normalization = from_host(
+            xp,
+            _type_c_normalization(n_end, s_alpha, s_beta),
+            dtype=theta.dtype,
+            device=theta.device,
+        )
     if isinstance(s_alpha, int):
         s_alpha = xp.asarray(s_alpha, dtype=theta.dtype, device=theta.device)
     if isinstance(s_beta, int):
         s_beta = xp.asarray(s_beta, dtype=theta.dtype, device=theta.device)
-    l_alpha = xp.arange(0, n_end, dtype=theta.dtype, device=theta.device)[
-        (None,) * (theta.ndim) + (slice(None), None)
-    ]  # 2d
-    l_beta = xp.arange(0, n_end, dtype=theta.dtype, device=theta.device)[
-        (None,) * (theta.ndim) + (None, slice(None))
-    ]  # 2d
-    n = xp.arange(0, (n_end + 1) // 2, dtype=theta.dtype, device=theta.device)[
-        (None,) * (theta.ndim) + (None, None, slice(None))
-    ]  # 3d
+    shape, (theta, s_alpha, s_beta) = _flatten_batch(theta, s_alpha, s_beta)
+    ladder = from_host(xp, _index_ladder(n_end), dtype=theta.dtype, device=theta.device)
+    l_alpha = ladder[(None,) * (theta.ndim) + (slice(None), None)]  # 2d
+    l_beta = ladder[(None,) * (theta.ndim) + (None, slice(None))]  # 2d
     alpha = l_alpha + s_alpha[..., None, None] / 2  # 2d
     beta = l_beta + s_beta[..., None, None] / 2  # 2d
-    res = (
-        2 ** ((alpha + beta) / 2 + 1)[..., None]
-        * jacobi_normalization_constant(
-            alpha=alpha[..., None], beta=beta[..., None], n=n
-        )
-        * (xp.sin(theta[..., None, None, None]) ** l_beta[..., None])
-        * (xp.cos(theta[..., None, None, None]) ** l_alpha[..., None])
-        * jacobi_all(
-            n_end=(n_end + 1) // 2,
-            alpha=beta,
-            beta=alpha,  # this is weird but correct
-            x=xp.cos(2 * theta[..., None, None]),
-        )
+    res = jacobi_all(
+        n_end=(n_end + 1) // 2,
+        alpha=beta,
+        beta=alpha,  # this is weird but correct
+        x=xp.cos(2 * theta[..., None, None]),
     )
+    if normalization is None:
+        n = ladder[: (n_end + 1) // 2][
+            (None,) * (theta.ndim) + (None, None, slice(None))
+        ]  # 3d
+        normalization = xp.astype(_type_c_normalization_from(alpha, beta, n), res.dtype)
+    res = multiply_into(res, normalization)
+    res = multiply_into(res, _power_ladder(xp.sin(theta), n_end)[..., None, :, None])
+    res = multiply_into(res, _power_ladder(xp.cos(theta), n_end)[..., :, None, None])
     # n_end = 3 -> max l = 2 -> max jacobi order = 1 -> jacobi n_end = 2
     # n_end = 4 -> max l = 3 -> max jacobi order = 1 -> jacobi n_end = 2
     # http://kuiperbelt.la.coocan.jp/sf/egan/Diaspora/atomic-orbital/
     # laplacian/4D-2.html
     if not index_with_surrogate_quantum_number:
-        # complicated reshaping
         # [l_alpha, l_beta, n] -> [l_alpha, l_beta, l = 2n + l_alpha + l_beta]
-        # 1. [l_alpha, l_beta, n] -> [l_alpha, l_beta, 2n]
-        # add zeros to the left for each row, i.e. [1, 2, 3] -> [1, 0, 2, 0, 3, 0]
-        res_expaneded = xp.zeros(
-            (*res.shape[:-1], n_end), dtype=res.dtype, device=res.device
-        )
-        res_expaneded[..., ::2] = res
-        # 2. [l_alpha, l_beta, 2n] -> [l_alpha, l_beta, 2n + l_alpha]
-        res_expaneded = shift_nth_row_n_steps(
-            res_expaneded,
-            axis_row=-3,
-            axis_shift=-1,
-            cut_padding=True,
-            fill_values=fill_value,
+        # in a single gather, l - l_alpha - l_beta must be even and non-negative
+        index, is_even, is_nonnegative = (
+            from_host(xp, a, device=res.device) for a in _type_c_gather_index(n_end)
         )
-        # 3. [l_alpha, l_beta, 2n + l_alpha] ->
-        # [l_alpha, l_beta, 2n + l_alpha + l_beta]
-        res = shift_nth_row_n_steps(
-            res_expaneded,
-            axis_row=-2,
-            axis_shift=-1,
-            cut_padding=True,
-            fill_values=fill_value,
+        res = xp.take_along_axis(res, index[(None,) * (res.ndim - 3) + (...,)], axis=-1)
+        res = xp.where(is_even, res, xp.zeros_like(res))
+        res = xp.where(
+            is_nonnegative,
+            res,
+            xp.asarray(fill_value, dtype=res.dtype, device=res.device),
         )
     if is_alpha_type_a_and_include_negative_m:
         res = to_symmetric(res, axis=-3, asymmetric=False, conjugate=False)
     if is_beta_type_a_and_include_negative_m:
         res = to_symmetric(res, axis=-2, asymmetric=False, conjugate=False)
-    return res
+    return xp.reshape(res, (*shape, *res.shape[1:]))
 
 
 def ndim_harmonics[TSpherical, TCartesian](
@@ -1,9 +1,59 @@
 from collections.abc import Mapping
+from functools import lru_cache
 
 from array_api._2024_12 import Array
 from array_api_compat import array_namespace
 from ultrasphere import BranchingType, SphericalCoordinates, get_child
 
+from ._flatten import _s_node_axes
+
+
+@lru_cache(maxsize=256)
+def _expand_dim_permutation[TSpherical, TCartesian](
+    c: SphericalCoordinates[TSpherical, TCartesian],
+    node: TSpherical,
+    /,
+) -> tuple[tuple[int, ...], int]:
+    """
+    The axes permutation used to expand the dimension of the harmonics.
+
+    Parameters
+    ----------
+    c : SphericalCoordinates[TSpherical, TCartesian]
+        The spherical coordinates.
+    node : TSpherical
+        The node of the spherical coordinates.
+
+    Returns
+    -------
+    tuple[tuple[int, ...], int]
+        The permutation of the last c.s_ndim axes
+        (after adding the new axes at the end)
+        and the number of axes of the eigenfunction of the node.
+
+    """
+    axes = _s_node_axes(c)
+    idx_node = axes[node]
+    branching_type = c.branching_types[node]
+    if branching_type == BranchingType.A:
+        destination = [idx_node]
+    elif branching_type == BranchingType.B:
+        idx_sin_child = axes[get_child(c.G, node, "sin")]
+        destination = [idx_sin_child, idx_node]
+    elif branching_type == BranchingType.BP:
+        idx_cos_child = axes[get_child(c.G, node, "cos")]
+        destination = [idx_cos_child, idx_node]
+    elif branching_type == BranchingType.C:
+        idx_cos_child = axes[get_child(c.G, node, "cos")]
+        idx_sin_child = axes[get_child(c.G, node, "sin")]
+        destination = [idx_cos_child, idx_sin_child, idx_node]
+    # the new axes fill the remaining positions in order
+    added = iter(range(len(destination), c.s_ndim))
+    source = {v: k for k, v in enumerate(destination)}
+    return tuple(
+        source[i] if i in source else next(added) for i in range(c.s_ndim)
+    ), len(destination)
+
 
 def _expand_dim_harmoncis[TSpherical, TCartesian](
     c: SphericalCoordinates[TSpherical, TCartesian],
@@ -42,34 +92,20 @@ def _expand_dim_harmoncis[TSpherical, TCartesian](
 
     """
     xp = array_namespace(harmonics)
-    idx_node = c.s_nodes.index(node)
-    branching_type = c.branching_types[node]
-    if branching_type == BranchingType.A:
-        moveaxis = {0: idx_node}
-    elif branching_type == BranchingType.B:
-        idx_sin_child = c.s_nodes.index(get_child(c.G, node, "sin"))
-        moveaxis = {
-            0: idx_sin_child,
-            1: idx_node,
-        }
-    elif branching_type == BranchingType.BP:
-        idx_cos_child = c.s_nodes.index(get_child(c.G, node, "cos"))
-        moveaxis = {
-            0: idx_cos_child,
-            1: idx_node,
-        }
-    elif branching_type == BranchingType.C:
-        idx_cos_child = c.s_nodes.index(get_child(c.G, node, "cos"))
-        idx_sin_child = c.s_nodes.index(get_child(c.G, node, "sin"))
-        moveaxis = {0: idx_cos_child, 1: idx_sin_child, 2: idx_node}
-    value_additional_ndim = harmonics.ndim - len(moveaxis)
-    moveaxis = {
-        k + value_additional_ndim: v + value_additional_ndim
-        for k, v in moveaxis.items()
-    }
-    adding_ndim = c.s_ndim - len(moveaxis)
-    harmonics = harmonics[(...,) + (None,) * adding_ndim]
-    return xp.moveaxis(harmonics, list(moveaxis.keys()), list(moveaxis.values()))
+    permutation, node_ndim = _expand_dim_permutation(c, node)
+    value_additional_ndim = harmonics.ndim - node_ndim
+    if c.s_ndim > node_ndim:
+        harmonics = harmonics[(...,) + (None,) * (c.s_ndim - node_ndim)]
+    # e.g. polar coordinates, where no axis has to be moved
+    if permutation == tuple(range(c.s_ndim)):
+        return harmonics
+    return xp.permute_dims(
+        harmonics,
+        (
+            *range(value_additional_ndim),
+            *(value_additional_ndim + i for i in permutation),
+        ),
+    )
 
 
 def expand_dims_harmonics[TSpherical, TCartesian](
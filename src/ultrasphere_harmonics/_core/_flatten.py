@@ -1,9 +1,12 @@
 from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any, Literal, overload
 
 import array_api_extra as xpx
 from array_api._2024_12 import Array, ArrayNamespaceFull
 from array_api_compat import array_namespace
+from array_api_compat import numpy as np
 from array_api_negative_index import to_symmetric
 from shift_nth_row_n_steps._torch_like import create_slice
 from ultrasphere import (
@@ -13,6 +16,28 @@ from ultrasphere import (
 )
 
 from ._assume import assume_n_end_and_include_negative_m_from_harmonics
+from ._cache import from_host, readonly
+
+
+@lru_cache(maxsize=256)
+def _s_node_axes[TSpherical, TCartesian](
+    c: SphericalCoordinates[TSpherical, TCartesian], /
+) -> Mapping[TSpherical, int]:
+    """
+    The axis of each node in the harmonics indexed by c.s_nodes.
+
+    Parameters
+    ----------
+    c : SphericalCoordinates[TSpherical, TCartesian]
+        The spherical coordinates.
+
+    Returns
+    -------
+    Mapping[TSpherical, int]
+        The position of each node in c.s_nodes.
+
+    """
+    return MappingProxyType({node: i for i, node in enumerate(c.s_nodes)})
 
 
 def _index_array_harmonics[TSpherical, TCartesian](
@@ -69,7 +94,7 @@ def _index_array_harmonics[TSpherical, TCartesian](
         # result = xp.arange(0, (n_end + 1) // 2)
         result = xp.arange(0, n_end, dtype=dtype, device=device)
     if expand_dims:
-        idx = c.s_nodes.index(node)
+        idx = _s_node_axes(c)[node]
         result = result[create_slice(c.s_ndim, [(idx, slice(None))], default=None)]
     return result
 
@@ -189,12 +214,16 @@ def _index_array_harmonics_all[TSpherical, TCartesian](
             axis=0,
         )
         if mask:
-            result[
-                :,
-                ~flatten_mask_harmonics(
-                    c, n_end=n_end, xp=xp, include_negative_m=include_negative_m
+            # integer indices are promoted to floating point to hold NaN
+            result = xp.where(
+                from_host(
+                    xp,
+                    _flatten_mask_harmonics_cached(c, n_end, include_negative_m),
+                    device=device,
                 ),
-            ] = xp.nan
+                result,
+                xp.nan,
+            )
         return result
     return index_arrays
 
@@ -245,15 +274,19 @@ def flatten_mask_harmonics[TSpherical, TCartesian](
            [ True,  True,  True]])
 
     """
-    index_arrays: Mapping[TSpherical, Array] = _index_array_harmonics_all(
-        c,
-        n_end=n_end,
-        include_negative_m=include_negative_m,
-        as_array=False,
-        expand_dims=True,
-        xp=xp,
-        device=device,
-    )
+    index_arrays = {
+        node: _index_array_harmonics(
+            c,
+            node,
+            n_end=n_end,
+            xp=xp,
+            include_negative_m=include_negative_m,
+            # only compared with each other, int32 is enough for any n_end
+            dtype=xp.int32,
+            device=device,
+        )
+        for node in c.s_nodes
+    }
     mask = xp.ones((1,) * c.s_ndim, dtype=bool, device=device)
     for node, branching_type in c.branching_types.items():
         if branching_type == BranchingType.B:
@@ -270,15 +303,121 @@ def flatten_mask_harmonics[TSpherical, TCartesian](
                 - xp.abs(index_arrays[get_child(c.G, node, "sin")])
                 - xp.abs(index_arrays[get_child(c.G, node, "cos")])
             )
-            mask = mask & (value % 2 == 0) & (value >= 0)
+            # the index arrays are integers, so the parity is the lowest bit
+            mask = mask & ((value & 1) == 0) & (value >= 0)
 
-    shape = xpx.broadcast_shapes(
-        *[index_array.shape for index_array in index_arrays.values()]
-    )
+    # each index array is non-singleton only along the axis of its node
+    shape = tuple(index_arrays[node].shape[i] for i, node in enumerate(c.s_nodes))
     mask = xp.broadcast_to(mask, shape)
     return mask
 
 
+@lru_cache(maxsize=256)
+def _flatten_mask_harmonics_cached[TSpherical, TCartesian](
+    c: SphericalCoordinates[TSpherical, TCartesian],
+    n_end: int,
+    include_negative_m: bool,
+    /,
+) -> np.ndarray:
+    """
+    Cached host-side `flatten_mask_harmonics`.
+
+    Parameters
+    ----------
+    c : SphericalCoordinates[TSpherical, TCartesian]
+        The spherical coordinates.
+    n_end : int
+        The maximum degree of the harmonic.
+    include_negative_m : bool
+        Whether to include negative m values.
+
+    Returns
+    -------
+    np.ndarray
+        The mask.
+
+    """
+    return readonly(
+        np.asarray(
+            flatten_mask_harmonics(
+                c, n_end=n_end, xp=np, include_negative_m=include_negative_m
+            )
+        )
+    )
+
+
+@lru_cache(maxsize=256)
+def _flatten_index_harmonics_cached[TSpherical, TCartesian](
+    c: SphericalCoordinates[TSpherical, TCartesian],
+    n_end: int,
+    include_negative_m: bool,
+    /,
+) -> tuple[np.ndarray, ...]:
+    """
+    Cached host-side indices of the valid combinations of the quantum numbers.
+
+    Gathering with these indices is equivalent to indexing with
+    `flatten_mask_harmonics` but does not scan the mask on every call.
+
+    Parameters
+    ----------
+    c : SphericalCoordinates[TSpherical, TCartesian]
+        The spherical coordinates.
+    n_end : int
+        The maximum degree of the harmonic.
+    include_negative_m : bool
+        Whether to include negative m values.
+
+    Returns
+    -------
+    tuple[np.ndarray, ...]
+        The indices for each axis of the mask, each of shape (n_harmonics,).
+
+    """
+    return tuple(
+        readonly(index)
+        for index in np.nonzero(
+            _flatten_mask_harmonics_cached(c, n_end, include_negative_m)
+        )
+    )
+
+
+def _flatten_index_harmonics[TSpherical, TCartesian](
+    c: SphericalCoordinates[TSpherical, TCartesian],
+    n_end: int,
+    xp: ArrayNamespaceFull,
+    include_negative_m: bool,
+    device: Any,
+    /,
+) -> tuple[Array, ...]:
+    """
+    `_flatten_index_harmonics_cached` converted to the namespace.
+
+    Parameters
+    ----------
+    c : SphericalCoordinates[TSpherical, TCartesian]
+        The spherical coordinates.
+    n_end : int
+        The maximum degree of the harmonic.
+    xp : ArrayNamespaceFull
+        The array namespace.
+    include_negative_m : bool
+        Whether to include negative m values.
+    device : Any
+        The device.
+
+    Returns
+    -------
+    tuple[Array, ...]
+        The indices for each axis of the mask, each of shape (n_harmonics,).
+
+    """
+    return tuple(
+        from_host(xp, index, device=device)
+        for index in _flatten_index_harmonics_cached(c, n_end, include_negative_m)
+    )
+
+
 def flatten_harmonics[TSpherical, TCartesian](
     c: SphericalCoordinates[TSpherical, TCartesian],
     harmonics: Array,
@@ -341,16 +480,14 @@ def flatten_harmonics[TSpherical, TCartesian](
             harmonics.shape if axis_end == -1 else harmonics.shape[: axis_end + 1],
             flatten=False,
         )
-    mask = flatten_mask_harmonics(
-        c,
-        n_end=n_end,
-        xp=xp,
-        include_negative_m=include_negative_m,
-        device=harmonics.device,
-    )
+    mask = _flatten_mask_harmonics_cached(c, n_end, include_negative_m)
+    index = _flatten_index_harmonics(c, n_end, xp, include_negative_m, harmonics.device)
     shape = xpx.broadcast_shapes(harmonics.shape, mask.shape + (1,) * (-axis_end - 1))
-    harmonics = xp.broadcast_to(harmonics, shape)
-    return harmonics[(..., mask) + (slice(None),) * (-axis_end - 1)]
+    if harmonics.shape != shape:
+        # the integer indices gather from the broadcasted view directly,
+        # no contiguous copy is needed
+        harmonics = xp.broadcast_to(harmonics, shape)
+    return harmonics[(..., *index) + (slice(None),) * (-axis_end - 1)]
 
 
 def unflatten_harmonics[TSpherical, TCartesian](
@@ -401,16 +538,11 @@ def unflatten_harmonics[TSpherical, TCartesian](
     n_end, _ = assume_n_end_and_include_negative_m_from_harmonics(
         c, harmonics, flatten=True
     )
-    mask = flatten_mask_harmonics(
-        c,
-        n_end=n_end,
-        xp=xp,
-        include_negative_m=include_negative_m,
-        device=harmonics.device,
-    )
+    mask = _flatten_mask_harmonics_cached(c, n_end, include_negative_m)
+    index = _flatten_index_harmonics(c, n_end, xp, include_negative_m, harmonics.device)
     shape = (*harmonics.shape[:-1], *mask.shape)
     result = xp.zeros(shape, dtype=harmonics.dtype, device=harmonics.device)
-    result[..., mask] = harmonics
+    result[(..., *index)] = harmonics
     return result
 
 
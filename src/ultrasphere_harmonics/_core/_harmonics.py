@@ -1,16 +1,93 @@
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
+from functools import lru_cache, partial
 from typing import Literal, overload
 
 from array_api._2024_12 import Array
 from ultrasphere import BranchingType, SphericalCoordinates, get_child
 from ultrasphere._coordinates import TCartesian, TSpherical
 
-from ._concat import concat_harmonics
+from ._concat import _concat_flatten_harmonics, concat_harmonics
 from ._eigenfunction import Phase, type_a, type_b, type_bdash, type_c
 from ._expand_dim import expand_dims_harmonics
 from ._flatten import flatten_harmonics
 
 
+@lru_cache(maxsize=256)
+def _eigenfunction_plan(
+    c: SphericalCoordinates[TSpherical, TCartesian],
+    include_negative_m: bool,
+    /,
+) -> tuple[tuple[TSpherical, bool, Callable[..., Array]], ...]:
+    """
+    The eigenfunction of each node with the arguments fixed by the tree.
+
+    Parameters
+    ----------
+    c : SphericalCoordinates[TSpherical, TCartesian]
+        The spherical coordinates.
+    include_negative_m : bool
+        Whether to include negative m values.
+
+    Returns
+    -------
+    tuple[tuple[TSpherical, bool, Callable[..., Array]], ...]
+        The node, whether the node is type a,
+        and the eigenfunction for each node in c.s_nodes.
+
+    Raises
+    ------
+    ValueError
+        If the branching type of a node is invalid.
+
+    """
+
+    def is_type_a_and_include_negative_m(node: TSpherical) -> bool:
+        return include_negative_m and c.branching_types[node] == BranchingType.A
+
+    plan: list[tuple[TSpherical, bool, Callable[..., Array]]] = []
+    for node in c.s_nodes:
+        branching_type = c.branching_types[node]
+        eigenfunction: Callable[..., Array]
+        if branching_type == BranchingType.A:
+            eigenfunction = partial(type_a, include_negative_m=include_negative_m)
+        elif branching_type == BranchingType.B:
+            sin_child = get_child(c.G, node, "sin")
+            eigenfunction = partial(
+                type_b,
+                s_beta=c.S[sin_child],
+                is_beta_type_a_and_include_negative_m=is_type_a_and_include_negative_m(
+                    sin_child
+                ),
+            )
+        elif branching_type == BranchingType.BP:
+            cos_child = get_child(c.G, node, "cos")
+            eigenfunction = partial(
+                type_bdash,
+                s_alpha=c.S[cos_child],
+                is_alpha_type_a_and_include_negative_m=is_type_a_and_include_negative_m(
+                    cos_child
+                ),
+            )
+        elif branching_type == BranchingType.C:
+            cos_child = get_child(c.G, node, "cos")
+            sin_child = get_child(c.G, node, "sin")
+            eigenfunction = partial(
+                type_c,
+                s_alpha=c.S[cos_child],
+                s_beta=c.S[sin_child],
+                is_alpha_type_a_and_include_negative_m=is_type_a_and_include_negative_m(
+                    cos_child
+                ),
+                is_beta_type_a_and_include_negative_m=is_type_a_and_include_negative_m(
+                    sin_child
+                ),
+            )
+        else:
+            raise ValueError(f"Invalid branching type {branching_type}.")
+        plan.append((node, branching_type == BranchingType.A, eigenfunction))
+    return tuple(plan)
+
+
 def _harmonics(
     c: SphericalCoordinates[TSpherical, TCartesian],
     spherical: Mapping[TSpherical, Array],
@@ -48,51 +125,15 @@ def _harmonics(
 
     """
     result = {}
-    for node in c.s_nodes:
-        value = spherical[node]
-        if node == "r":
-            continue
-        if node not in c.s_nodes:
-            raise ValueError(f"Key {node} is not in c.s_nodes {c.s_nodes}.")
-        if c.branching_types[node] == BranchingType.A:
-            result[node] = type_a(
-                value,
-                n_end=n_end,
-                phase=phase,
-                include_negative_m=include_negative_m,
-            )
-        elif c.branching_types[node] == BranchingType.B:
-            result[node] = type_b(
-                value,
-                n_end=n_end,
-                s_beta=c.S[get_child(c.G, node, "sin")],
-                index_with_surrogate_quantum_number=index_with_surrogate_quantum_number,
-                is_beta_type_a_and_include_negative_m=include_negative_m
-                and c.branching_types[get_child(c.G, node, "sin")] == BranchingType.A,
-            )
-        elif c.branching_types[node] == BranchingType.BP:
-            result[node] = type_bdash(
-                value,
-                n_end=n_end,
-                s_alpha=c.S[get_child(c.G, node, "cos")],
-                index_with_surrogate_quantum_number=index_with_surrogate_quantum_number,
-                is_alpha_type_a_and_include_negative_m=include_negative_m
-                and c.branching_types[get_child(c.G, node, "cos")] == BranchingType.A,
-            )
-        elif c.branching_types[node] == BranchingType.C:
-            result[node] = type_c(
-                value,
+    for node, is_type_a, eigenfunction in _eigenfunction_plan(c, include_negative_m):
+        if is_type_a:
+            result[node] = eigenfunction(spherical[node], n_end=n_end, phase=phase)
+        else:
+            result[node] = eigenfunction(
+                spherical[node],
                 n_end=n_end,
-                s_alpha=c.S[get_child(c.G, node, "cos")],
-                s_beta=c.S[get_child(c.G, node, "sin")],
                 index_with_surrogate_quantum_number=index_with_surrogate_quantum_number,
-                is_alpha_type_a_and_include_negative_m=include_negative_m
-                and c.branching_types[get_child(c.G, node, "cos")] == BranchingType.A,
-                is_beta_type_a_and_include_negative_m=include_negative_m
-                and c.branching_types[get_child(c.G, node, "sin")] == BranchingType.A,
             )
-        else:
-            raise ValueError(f"Invalid branching type {c.branching_types[node]}.")
     return result
 
 
@@ -150,6 +191,8 @@ def harmonics(
         The spherical coordinates.
     spherical : Mapping[TSpherical, Array]
         The spherical coordinates.
+        float32 coordinates are evaluated in single precision
+        and give complex64 harmonics.
     n_end : int
         The maximum degree of the harmonic.
     phase : Phase
@@ -286,11 +329,13 @@ def harmonics(
     )
     if expand_dims:
         result = expand_dims_harmonics(c, result)
+    if concat and flatten:
+        # avoid building the full product only to drop the invalid combinations
+        return _concat_flatten_harmonics(
+            c, result, n_end=n_end, include_negative_m=include_negative_m
+        )
     if concat:
         result = concat_harmonics(c, result)
     if flatten:
-        if concat:
-            result = flatten_harmonics(c, result)
-        else:
-            result = {k: flatten_harmonics(c, v) for k, v in result.items()}
+        result = {k: flatten_harmonics(c, v) for k, v in result.items()}
     return result
@@ -0,0 +1,34 @@
+from array_api._2024_12 import Array
+from array_api_compat import array_namespace, is_numpy_namespace
+
+
+def multiply_into(result: Array, factor: Array, /) -> Array:
+    """
+    Multiply the factor into the result, in place where it is safe.
+
+    The result is only updated in place for NumPy,
+    to keep the autograd graphs of the other backends intact,
+    and only if the product has the shape and dtype of the result.
+
+    Parameters
+    ----------
+    result : Array
+        A freshly allocated array owned by the caller.
+    factor : Array
+        The factor, broadcastable to the result.
+
+    Returns
+    -------
+    Array
+        The product, which may be the result itself.
+
+    """
+    xp = array_namespace(result, factor)
+    if (
+        is_numpy_namespace(xp)
+        and xp.broadcast_arrays(result, factor)[0].shape == result.shape
+        and xp.result_type(result, factor) == result.dtype
+    ):
+        result *= factor
+        return result
+    return result * factor
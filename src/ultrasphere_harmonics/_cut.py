@@ -66,9 +66,7 @@ def expand_cut[TCartesian, TSpherical](
     (4,)
 
     """
+    index = (..., slice(None, int(harm_n_ndim_le(n_end, c_ndim=c.c_ndim))))
     if isinstance(expansion, Mapping):
-        return {
-            k: v[..., : int(harm_n_ndim_le(n_end, c_ndim=c.c_ndim))]
-            for k, v in expansion.items()
-        }
-    return expansion[..., : int(harm_n_ndim_le(n_end, c_ndim=c.c_ndim))]
+        return {k: v[index] for k, v in expansion.items()}
+    return expansion[index]
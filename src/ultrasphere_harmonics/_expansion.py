@@ -1,19 +1,45 @@
 from collections.abc import Callable, Mapping
+from functools import cache
 from typing import Any, Literal, overload
 
-import array_api_extra as xpx
 from array_api._2024_12 import Array, ArrayNamespaceFull
 from array_api_compat import array_namespace
-from ultrasphere import (
-    SphericalCoordinates,
-    integrate,
-)
+from ultrasphere import SphericalCoordinates, integrate
 
 from ._core import assume_n_end_and_include_negative_m_from_harmonics, harmonics
 from ._core._eigenfunction import Phase
 from ._core._eigenfunction import ndim_harmonics as ndim_harmonics_
 
 
+@cache
+def _insert_axes_index(
+    ndim_before: int, ndim_inserted: int, ndim_after: int, /
+) -> tuple[slice | None, ...]:
+    """
+    Index that inserts new axes between the leading and trailing axes.
+
+    Parameters
+    ----------
+    ndim_before : int
+        The number of leading axes to keep.
+    ndim_inserted : int
+        The number of new axes to insert.
+    ndim_after : int
+        The number of trailing axes to keep.
+
+    Returns
+    -------
+    tuple[slice | None, ...]
+        The index tuple.
+
+    """
+    return (
+        (slice(None),) * ndim_before
+        + (None,) * ndim_inserted
+        + (slice(None),) * ndim_after
+    )
+
+
 @overload
 def expand[TCartesian, TSpherical](
     c: SphericalCoordinates[TSpherical, TCartesian],
@@ -33,6 +59,7 @@ def expand[TCartesian, TSpherical](
     xp: ArrayNamespaceFull,
     device: Any | None = None,
     dtype: Any | None = None,
+    harmonics_roots: Mapping[TSpherical, Array] | None = None,
 ) -> Mapping[TSpherical, Array]: ...
 
 
@@ -55,6 +82,7 @@ def expand[TCartesian, TSpherical](
     xp: ArrayNamespaceFull,
     device: Any | None = None,
     dtype: Any | None = None,
+    harmonics_roots: Array | None = None,
 ) -> Array: ...
 
 
@@ -76,6 +104,7 @@ def expand[TCartesian, TSpherical](
     xp: ArrayNamespaceFull,
     device: Any | None = None,
     dtype: Any | None = None,
+    harmonics_roots: Mapping[TSpherical, Array] | Array | None = None,
 ) -> Array | Mapping[TSpherical, Array]:
     r"""
     Calculate the expansion coefficients of the function over the hypersphere.
@@ -141,6 +170,13 @@ def expand[TCartesian, TSpherical](
         The device, by default None
     dtype : Any, optional
         The data type, by default None
+    harmonics_roots : Mapping[TSpherical, Array] | Array, optional
+        The harmonics at the integration points, by default None
+        If None, they are calculated from the integration points.
+        Precompute them with `harmonics` at the points from `ultrasphere.roots`
+        (with expand_dims_x, expand_dims and concat
+        set to not does_f_support_separation_of_variables)
+        to reuse them across repeated calls with the same grid.
 
     Returns
     -------
@@ -226,14 +262,27 @@ def expand[TCartesian, TSpherical](
             val = f
 
         # calculate harmonics
-        Y = harmonics(  # type: ignore[call-overload]
-            c,
-            xs,
-            n_end=n_end,
-            phase=phase,
-            expand_dims=not does_f_support_separation_of_variables,
-            concat=not does_f_support_separation_of_variables,
-        )
+        if harmonics_roots is None:
+            Y = harmonics(  # type: ignore[call-overload]
+                c,
+                xs,
+                n_end=n_end,
+                phase=phase,
+                expand_dims=not does_f_support_separation_of_variables,
+                concat=not does_f_support_separation_of_variables,
+            )
+        else:
+            Y = harmonics_roots
+        # conj would only copy real harmonics (type b, b', c)
+        if isinstance(Y, Mapping):
+            Y = {
+                node: xp.conj(harm)
+                if xp.isdtype(harm.dtype, "complex floating")
+                else harm
+                for node, harm in Y.items()
+            }
+        elif xp.isdtype(Y.dtype, "complex floating"):
+            Y = xp.conj(Y)
 
         # multiply f and harmonics
         # (C,complex conjugate) is star-algebra
@@ -250,14 +299,12 @@ def expand[TCartesian, TSpherical](
                 # val: theta(node),u1,...,uM
                 # harmonics: theta(node),harm1,...,harmNnode
                 # result: theta(node),u1,...,uM,harm1,...,harmNnode
-                xpx.broadcast_shapes(value.shape[:1], Y[node].shape[:1])
+                # (mismatched theta(node) axes raise in the multiply below)
                 ndim_val = value.ndim - 1
                 ndim_harm = ndim_harmonics_(c, node)
-                value = value[(...,) + (None,) * (ndim_harm)]
-                harm = Y[node][
-                    (slice(None),) + (None,) * ndim_val + (slice(None),) * ndim_harm
-                ]
-                result[node] = value * xp.conj(harm)
+                value = value[_insert_axes_index(value.ndim, ndim_harm, 0)]
+                harm = Y[node][_insert_axes_index(1, ndim_val, ndim_harm)]
+                result[node] = value * harm
         else:
             if does_f_support_separation_of_variables:
                 raise ValueError(
@@ -268,11 +315,10 @@ def expand[TCartesian, TSpherical](
             # val: theta1,...,thetaN,u1,...,uM
             # harmonics: theta1,...,thetaN,harm
             # res: theta1,...,thetaN,u1,...,uM,harm
-            xpx.broadcast_shapes(val.shape[: c.s_ndim], Y.shape[: c.s_ndim])
             ndim_val = val.ndim - c.s_ndim
             val = val[..., None]
-            Y = Y[(slice(None),) * c.s_ndim + (None,) * ndim_val + (slice(None),)]
-            result = val * xp.conj(Y)
+            Y = Y[_insert_axes_index(c.s_ndim, ndim_val, 1)]
+            result = val * Y
 
         return result
 
@@ -287,6 +333,40 @@ def expand[TCartesian, TSpherical](
     )
 
 
+def _contract_harmonics(Y: Array, expansion: Array, ndim_harmonics: int, /) -> Array:
+    """
+    Sum the product of the harmonics and the expansion over the harmonic axes.
+
+    A single tensordot, so the broadcasted product
+    of shape (*shape_s, *shape_e, *shape_harm) is never built.
+
+    Parameters
+    ----------
+    Y : Array
+        The harmonics of shape (*shape_s, *shape_harm).
+    expansion : Array
+        The expansion coefficients of shape (*shape_e, *shape_harm).
+    ndim_harmonics : int
+        The number of harmonic axes, len(shape_harm).
+
+    Returns
+    -------
+    Array
+        The contracted value of shape (*shape_s, *shape_e).
+
+    """
+    xp = array_namespace(Y, expansion)
+    dtype = xp.result_type(Y, expansion)
+    return xp.tensordot(
+        xp.astype(Y, dtype, copy=False),
+        xp.astype(expansion, dtype, copy=False),
+        axes=(
+            tuple(range(Y.ndim - ndim_harmonics, Y.ndim)),
+            tuple(range(expansion.ndim - ndim_harmonics, expansion.ndim)),
+        ),
+    )
+
+
 @overload
 def expand_evaluate[TCartesian, TSpherical](
     c: SphericalCoordinates[TSpherical, TCartesian],
@@ -341,12 +421,9 @@ def expand_evaluate[TCartesian, TSpherical](
 
     """
     is_mapping = isinstance(expansion, Mapping)
-    xp = (
-        array_namespace(*[expansion[k] for k in c.s_nodes])
-        if is_mapping
-        else array_namespace(expansion)
+    n_end, _ = assume_n_end_and_include_negative_m_from_harmonics(
+        c, expansion, flatten=not is_mapping
     )
-    n_end, _ = assume_n_end_and_include_negative_m_from_harmonics(c, expansion)
     if "r" in spherical:
         raise ValueError("Passing points not on the sphere is not supported.")
     Y = harmonics(  # type: ignore[call-overload]
@@ -358,45 +435,17 @@ def expand_evaluate[TCartesian, TSpherical](
         concat=not is_mapping,
         flatten=not is_mapping,
     )
-    if is_mapping:
-        result: dict[TSpherical, Array] = {}
-        for node in c.s_nodes:
-            expansion_ = expansion[node]
-            Y_ = Y[node]
-            # expansion: f1,...,fL,harm1,...,harmNnode
-            # harmonics: u1,...,uM,harm1,...,harmNnode
-            # result: u1,...,uM,f1,...,fL
-            ndim_harmonics = ndim_harmonics_(c, node)
-            ndim_expansion = expansion_.ndim - ndim_harmonics
-            ndim_extra_harmonics = Y_.ndim - ndim_harmonics
-            expansion_ = Y_[
-                (None,) * (ndim_extra_harmonics)
-                + (slice(None),) * (ndim_expansion + ndim_harmonics)
-            ]
-            Y_ = Y_[
-                (slice(None),) * ndim_extra_harmonics
-                + (None,) * ndim_expansion
-                + (slice(None),) * ndim_harmonics
-            ]
-            result_ = Y_ * expansion_
-            for _ in range(ndim_harmonics):
-                result_ = xp.sum(result_, axis=-1)
-            result[node] = result
-        return result
     if isinstance(expansion, Mapping):
-        raise AssertionError()
+        # expansion: f1,...,fL,harm1,...,harmNnode
+        # harmonics: u1,...,uM,harm1,...,harmNnode
+        # result: u1,...,uM,f1,...,fL
+        return {
+            node: _contract_harmonics(
+                Y[node], expansion[node], ndim_harmonics_(c, node)
+            )
+            for node in c.s_nodes
+        }
     # expansion: f1,...,fL,harm
     # harmonics: u1,...,uM,harm
     # result: u1,...,uM,f1,...,fL
-    ndim_expansion = expansion.ndim - 1
-    ndim_extra_harmonics = Y.ndim - 1
-    expansion = expansion[
-        (None,) * (ndim_extra_harmonics) + (slice(None),) * (ndim_expansion + 1)
-    ]
-    Y = Y[
-        (slice(None),) * ndim_extra_harmonics
-        + (None,) * ndim_expansion
-        + (slice(None),)
-    ]
-    result = xp.sum(Y * expansion, axis=-1)
-    return result
+    return _contract_harmonics(Y, expansion, 1)
@@ -1,15 +1,62 @@
 from collections.abc import Mapping
+from functools import lru_cache
 from typing import Literal, overload
 
 from array_api._2024_12 import Array
 from array_api_compat import array_namespace
+from array_api_compat import numpy as np
 from ultrasphere import SphericalCoordinates
 from ultrasphere.special import szv
 
 from ultrasphere_harmonics._core._eigenfunction import Phase
 
 from ._core import harmonics
-from ._core._flatten import flatten_harmonics, index_array_harmonics
+from ._core._cache import from_host, readonly
+from ._core._flatten import index_array_harmonics
+from ._core._inplace import multiply_into
+
+
+@lru_cache(maxsize=256)
+def _root_index_array_cached[TSpherical, TCartesian](
+    c: SphericalCoordinates[TSpherical, TCartesian],
+    n_end: int,
+    expand_dims: bool,
+    flatten: bool,
+    /,
+) -> np.ndarray:
+    """
+    Cached host-side `index_array_harmonics` of the root node.
+
+    Parameters
+    ----------
+    c : SphericalCoordinates[TSpherical, TCartesian]
+        The spherical coordinates.
+    n_end : int
+        The maximum degree of the harmonic.
+    expand_dims : bool
+        Whether to expand dimensions.
+    flatten : bool
+        Whether to flatten the result.
+
+    Returns
+    -------
+    np.ndarray
+        The index array of the root node.
+
+    """
+    return readonly(
+        np.asarray(
+            index_array_harmonics(
+                c,
+                c.root,
+                n_end=n_end,
+                include_negative_m=True,
+                xp=np,
+                expand_dims=expand_dims,
+                flatten=flatten,
+            )
+        )
+    )
 
 
 @overload
@@ -144,29 +191,44 @@ def harmonics_regular_singular_component[TCartesian, TSpherical](  # type: ignor
     if flatten and not expand_dims:
         raise ValueError("expand_dims must be True if flatten is True.")
     xp = array_namespace(k, spherical["r"])
-    extra_dims = spherical["r"].ndim
-    n = index_array_harmonics(
-        c,
-        c.root,
-        n_end=n_end,
-        include_negative_m=True,
-        xp=xp,
-        expand_dims=expand_dims,
-        flatten=False,
-        device=spherical["r"].device,
-    )[(None,) * extra_dims + (...,)]
-
-    kr = k * spherical["r"]
-    kr = kr[(...,) + (None,) * c.s_ndim]
-
     if type == "regular":
         type = "j"
     elif type == "singular":
         type = "h1"
-    val = szv(n, c.c_ndim, kr, type=type, derivative=derivative)
-    # val = xp.nan_to_num(val, nan=0)
+    kr = k * spherical["r"]
     if flatten:
-        val = flatten_harmonics(c, val, n_end=n_end, include_negative_m=True)
+        # evaluate each degree once and gather it into the flattened slots;
+        # the root index is the signed order m for polar coordinates
+        n_start = 1 - n_end if c.c_ndim == 2 else 0
+        n = xp.arange(n_start, n_end, device=spherical["r"].device)
+        if derivative and (c.c_ndim > 2 or type in ("h1", "h2")):
+            # szv would evaluate both f_n and f_{n + 1} for
+            # f_n' = n / z f_n - f_{n + 1}; share one evaluation instead
+            val = szv(
+                xp.arange(n_start, n_end + 1, device=spherical["r"].device),
+                c.c_ndim,
+                kr[..., None],
+                type=type,
+            )
+            val = n / kr[..., None] * val[..., :-1] - val[..., 1:]
+        else:
+            val = szv(n, c.c_ndim, kr[..., None], type=type, derivative=derivative)
+        n_flat = from_host(
+            xp,
+            _root_index_array_cached(c, n_end, True, True),
+            device=spherical["r"].device,
+        )
+        val = xp.take(val, n_flat - n_start, axis=-1)
+    else:
+        extra_dims = spherical["r"].ndim
+        n = from_host(
+            xp,
+            _root_index_array_cached(c, n_end, expand_dims, False),
+            device=spherical["r"].device,
+        )
+        n = xp.reshape(n, (1,) * extra_dims + n.shape)
+        kr = xp.reshape(kr, kr.shape + (1,) * c.s_ndim)
+        val = szv(n, c.c_ndim, kr, type=type, derivative=derivative)
     if not concat:
         return {"r": val}
     return val
@@ -234,6 +296,11 @@ def harmonics_regular_singular[TCartesian, TSpherical](
     S_n (x) &:= h_n^{(1)} \left(\|x\|\right) Y_n^m \left(\frac{x}{\|x\|}\right)
     $$
 
+    This is the product of `harmonics` and
+    `harmonics_regular_singular_component`.
+    When only k or r changes between calls,
+    compute `harmonics` once and multiply it by the radial component.
+
     Parameters
     ----------
     c : SphericalCoordinates[TSpherical, TCartesian]
@@ -299,7 +366,7 @@ def harmonics_regular_singular[TCartesian, TSpherical](
     array([0.24+0.j  , 0.13+0.j  , 0.03+0.04j, 0.03-0.04j])
 
     """
-    return harmonics(  # type: ignore[call-overload]
+    Y = harmonics(  # type: ignore[call-overload]
         c,
         spherical,
         n_end=n_end,
@@ -309,7 +376,8 @@ def harmonics_regular_singular[TCartesian, TSpherical](
         expand_dims=expand_dims,
         flatten=flatten,
         concat=concat,
-    ) * harmonics_regular_singular_component(  # type: ignore[call-overload]
+    )
+    R = harmonics_regular_singular_component(  # type: ignore[call-overload]
         c,
         spherical,
         n_end=n_end,
@@ -320,3 +388,7 @@ def harmonics_regular_singular[TCartesian, TSpherical](
         flatten=flatten,
         concat=concat,
     )
+    if not concat:
+        return Y * R
+    # Y is freshly allocated, so the radial factor can be multiplied into it
+    return multiply_into(Y, R)
@@ -1,10 +1,32 @@
-import array_api_extra as xpx
+from functools import cache
+from math import comb
+
 import numpy as np
 from array_api._2024_12 import Array
 from array_api_compat import array_namespace
 from jacobi_poly import binom
 
 
+@cache
+def _homogeneous_ndim_eq_int(n: int, c_ndim: int) -> int:
+    """`homogeneous_ndim_eq` for Python ints, exact and cached."""
+    if n < 0:
+        return 0
+    return comb(n + c_ndim - 1, c_ndim - 1)
+
+
+@cache
+def _harm_n_ndim_eq_int(n: int, c_ndim: int) -> int:
+    """`harm_n_ndim_eq` for Python ints, exact and cached."""
+    if c_ndim == 1:
+        return 1 if n <= 1 else 0
+    if c_ndim == 2:
+        return 1 if n == 0 else 2
+    if n < 0:
+        return 0
+    return (2 * n + c_ndim - 2) * comb(n + c_ndim - 3, c_ndim - 3) // (c_ndim - 2)
+
+
 def homogeneous_ndim_eq(n: int | Array, *, c_ndim: int) -> int | Array:
     r"""
     The dimension of the homogeneous polynomials of degree equals to n.
@@ -36,10 +58,17 @@ def homogeneous_ndim_eq(n: int | Array, *, c_ndim: int) -> int | Array:
     array(10)
 
     """
+    if isinstance(n, int) and isinstance(c_ndim, int):
+        return np.asarray(_homogeneous_ndim_eq_int(n, c_ndim))
+    try:
+        xp = array_namespace(n)
+    except TypeError:
+        xp = np
+        n = xp.asarray(n)
     s_ndim = c_ndim - 1
-    result = binom(n + s_ndim, s_ndim)
-    xp = array_namespace(result)
-    return xp.asarray(xp.astype(xp.round(result), int))
+    # there are no polynomials of negative degree
+    result = binom(xp.maximum(n, 0) + s_ndim, s_ndim)
+    return xp.asarray(xp.where(n < 0, 0, xp.astype(xp.round(result), int)))
 
 
 def homogeneous_ndim_le(n_end: int | Array, *, c_ndim: int) -> int | Array:
@@ -86,22 +115,20 @@ def homogeneous_ndim_le(n_end: int | Array, *, c_ndim: int) -> int | Array:
     array(10)
 
     """
+    if isinstance(n_end, int) and isinstance(c_ndim, int):
+        return np.asarray(
+            0 if n_end < 1 else _homogeneous_ndim_eq_int(n_end - 1, c_ndim + 1)
+        )
     try:
         xp = array_namespace(n_end)
     except TypeError:
         xp = np
         n_end = xp.asarray(n_end)
-    c_ndim = xp.asarray(c_ndim, dtype=n_end.dtype, device=n_end.device)  # type: ignore
-    return xpx.apply_where(
+    # M(n - 1, d + 1) is also M(0, d) = 1 for n = 1
+    return xp.where(
         n_end < 1,
-        (n_end, c_ndim),
-        lambda n_end, c_ndim: 0,
-        lambda n_end, c_ndim: xpx.apply_where(
-            n_end == 1,
-            (n_end, c_ndim),
-            lambda n_end, c_ndim: homogeneous_ndim_eq(0, c_ndim=c_ndim),
-            lambda n_end, c_ndim: homogeneous_ndim_eq(n_end - 1, c_ndim=c_ndim + 1),
-        ),
+        0,
+        homogeneous_ndim_eq(xp.maximum(n_end - 1, 0), c_ndim=c_ndim + 1),
     )
 
 
@@ -148,28 +175,21 @@ def harm_n_ndim_eq(n: int | Array, *, c_ndim: int) -> int | Array:
     array(7)
 
     """
+    if isinstance(n, int) and isinstance(c_ndim, int):
+        return np.asarray(_harm_n_ndim_eq_int(n, c_ndim))
     try:
         xp = array_namespace(n)
     except TypeError:
         xp = np
         n = xp.asarray(n)
-    c_ndim = xp.asarray(c_ndim, dtype=n.dtype, device=n.device)  # type: ignore
-    return xpx.apply_where(
-        c_ndim > 2,
-        (n, c_ndim),
-        lambda n, c_ndim: xp.astype(
-            xp.round(
-                (2 * n + c_ndim - 2) / (c_ndim - 2) * binom(n + c_ndim - 3, c_ndim - 3)
-            ),
-            int,
-        ),
-        lambda n, c_ndim: xpx.apply_where(
-            c_ndim == 1,
-            (n,),
-            lambda n: xp.where(n <= 1, 1, 0),
-            lambda n: xp.where(n == 0, 1, 2),
-        ),
-    )
+    if c_ndim == 1:
+        return xp.where(n <= 1, 1, 0)
+    if c_ndim == 2:
+        return xp.where(n == 0, 1, 2)
+    # there are no harmonics of negative degree
+    n_ = xp.maximum(n, 0)
+    result = (2 * n_ + c_ndim - 2) / (c_ndim - 2) * binom(n_ + c_ndim - 3, c_ndim - 3)
+    return xp.asarray(xp.where(n < 0, 0, xp.astype(xp.round(result), int)))
 
 
 def harm_n_ndim_le(n_end: int | Array, *, c_ndim: int) -> int | Array:
@@ -209,20 +229,18 @@ def harm_n_ndim_le(n_end: int | Array, *, c_ndim: int) -> int | Array:
     array(9)
 
     """
+    if isinstance(n_end, int) and isinstance(c_ndim, int):
+        return np.asarray(
+            0 if n_end < 1 else _harm_n_ndim_eq_int(n_end - 1, c_ndim + 1)
+        )
     try:
         xp = array_namespace(n_end)
     except TypeError:
         xp = np
         n_end = xp.asarray(n_end)
-    c_ndim = xp.asarray(c_ndim, dtype=n_end.dtype, device=n_end.device)  # type: ignore
-    return xpx.apply_where(
+    # N(n - 1, d + 1) is also N(0, d) = 1 for n = 1
+    return xp.where(
         n_end < 1,
-        (n_end, c_ndim),
-        lambda n_end, c_ndim: 0,
-        lambda n_end, c_ndim: xpx.apply_where(
-            n_end == 1,
-            (n_end, c_ndim),
-            lambda n_end, c_ndim: harm_n_ndim_eq(0, c_ndim=c_ndim),
-            lambda n_end, c_ndim: harm_n_ndim_eq(n_end - 1, c_ndim=c_ndim + 1),
-        ),
+        0,
+        harm_n_ndim_eq(xp.maximum(n_end - 1, 0), c_ndim=c_ndim + 1),
     )
@@ -1,7 +1,7 @@
+import math
 from collections.abc import Mapping
 from typing import Any, Literal
 
-import numpy as np
 from array_api._2024_12 import Array, ArrayNamespaceFull
 from array_api_compat import array_namespace
 from gumerov_expansion_coefficients import translational_coefficients
@@ -329,7 +329,7 @@ def _harmonics_translation_coef_triplet[TCartesian, TSpherical](
     )[None, None, :]
 
     # returns [user1,...,userM,n1,...,nN,np1,...,npN]
-    coef = (2 * xp.pi) ** (c.c_ndim / 2) * np.sqrt(2 / np.pi)
+    coef = (2 * math.pi) ** (c.c_ndim / 2) * math.sqrt(2 / math.pi)
     t_RS = harmonics_regular_singular(
         c,
         spherical,
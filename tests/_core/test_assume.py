@@ -0,0 +1,32 @@
+import pytest
+from array_api._2024_12 import ArrayNamespaceFull
+from ultrasphere import create_polar, create_spherical, create_standard
+
+from ultrasphere_harmonics._core._assume import (
+    assume_n_end_and_include_negative_m_from_harmonics,
+)
+from ultrasphere_harmonics._ndim import harm_n_ndim_le
+
+
+@pytest.mark.parametrize(
+    "c",
+    [
+        create_polar(),
+        create_spherical(),
+        create_standard(3),
+    ],
+)
+@pytest.mark.parametrize("n_end", [0, 1, 2, 7, 33])
+def test_assume_flatten(n_end: int, c, xp: ArrayNamespaceFull) -> None:
+    size = int(harm_n_ndim_le(n_end, c_ndim=c.c_ndim))
+    expansion = xp.zeros((2, size))
+    assert assume_n_end_and_include_negative_m_from_harmonics(c, expansion) == (
+        n_end,
+        True,
+    )
+
+
+def test_assume_flatten_invalid_size(xp: ArrayNamespaceFull) -> None:
+    c = create_spherical()
+    with pytest.raises(ValueError, match="does not correspond to any n_end"):
+        assume_n_end_and_include_negative_m_from_harmonics(c, xp.zeros((5,)))
@@ -1,11 +1,18 @@
 from typing import Any
 
+import array_api_extra as xpx
 import numpy as np
 import pytest
 from array_api._2024_12 import ArrayNamespaceFull
 from array_api_compat import to_device
 
-from ultrasphere_harmonics._core._eigenfunction import type_b, type_bdash, type_c
+from ultrasphere_harmonics._core._eigenfunction import (
+    Phase,
+    type_a,
+    type_b,
+    type_bdash,
+    type_c,
+)
 
 
 def _type_b_scalar(
@@ -227,3 +234,17 @@ def test_type_c(
                 assert res == pytest.approx(
                     to_device((xp.cos(2 * theta)) * np.sqrt(3 / 2) * 2, "cpu")
                 )
+
+
+@pytest.mark.parametrize("include_negative_m", [True, False])
+def test_type_a_complex(
+    include_negative_m: bool, xp: ArrayNamespaceFull, device: Any
+) -> None:
+    theta = xp.asarray([0.3 + 0.2j, -1.1 - 0.5j], device=device)
+    n_end = 4
+    m = [0, 1, 2, 3, -3, -2, -1] if include_negative_m else [0, 1, 2, 3]
+    expected = xp.exp(
+        1j * xp.asarray(m, dtype=theta.dtype, device=device) * theta[:, None]
+    ) / np.sqrt(2 * np.pi)
+    actual = type_a(theta, n_end, phase=Phase(0), include_negative_m=include_negative_m)
+    assert xp.all(xpx.isclose(actual, expected))
@@ -5,18 +5,23 @@ import array_api_extra as xpx
 import pytest
 from array_api._2024_12 import Array, ArrayNamespaceFull
 from ultrasphere import (
+    BranchingType,
     SphericalCoordinates,
+    create_from_branching_types,
     create_hopf,
     create_random,
     create_spherical,
+    get_child,
 )
 from ultrasphere._integral import roots
 
 from ultrasphere_harmonics._core import harmonics as harmonics_
 from ultrasphere_harmonics._core._eigenfunction import Phase
 from ultrasphere_harmonics._core._flatten import (
+    _index_array_harmonics,
     _index_array_harmonics_all,
     flatten_harmonics,
+    flatten_mask_harmonics,
     unflatten_harmonics,
 )
 
@@ -64,6 +69,17 @@ def test_index_array_harmonics_all[TCartesian, TSpherical](
         assert xp.all(iall_concat[i] == iall[s_node])
 
 
+def test_index_array_harmonics_all_mask(xp: ArrayNamespaceFull, device: Any) -> None:
+    c = create_spherical()
+    iall = _index_array_harmonics_all(
+        c, n_end=3, as_array=True, mask=True, xp=xp, device=device
+    )
+    # |m| <= l
+    valid = xp.abs(iall[1]) <= iall[0]
+    assert xp.all(valid | xp.isnan(iall[0]))
+    assert int(xp.sum(xp.astype(~xp.isnan(iall[0]), xp.int64))) == 9
+
+
 @pytest.mark.parametrize(
     "c",
     [
@@ -94,3 +110,58 @@ def test_flatten_unflatten_harmonics[TSpherical, TCartesian](
     flattened = flatten_harmonics(c, harmonics)
     unflattened = unflatten_harmonics(c, flattened)
     assert xp.all(harmonics == unflattened)
+
+
+def test_parity_lowest_bit_negative(xp: ArrayNamespaceFull, device: Any) -> None:
+    value = xp.arange(-7, 8, dtype=xp.int32, device=device)
+    assert xp.all(((value & 1) == 0) == (value % 2 == 0))
+
+
+@pytest.mark.parametrize(
+    "c", [create_hopf(2), create_hopf(3), create_from_branching_types("cbaba")]
+)
+@pytest.mark.parametrize("include_negative_m", [True, False])
+def test_flatten_mask_harmonics_type_c[TCartesian, TSpherical](
+    c: SphericalCoordinates[TSpherical, TCartesian],
+    include_negative_m: bool,
+    xp: ArrayNamespaceFull,
+    device: Any,
+) -> None:
+    n_end = 5
+    index_arrays = {
+        node: _index_array_harmonics(
+            c,
+            node,
+            n_end=n_end,
+            xp=xp,
+            include_negative_m=include_negative_m,
+            dtype=xp.int32,
+            device=device,
+        )
+        for node in c.s_nodes
+    }
+    # the construction with the modulo, the type c values may be negative
+    expected = xp.ones((1,) * c.s_ndim, dtype=xp.bool, device=device)
+    has_negative = False
+    for node, branching_type in c.branching_types.items():
+        if branching_type == BranchingType.B:
+            expected = expected & (
+                xp.abs(index_arrays[get_child(c.G, node, "sin")]) <= index_arrays[node]
+            )
+        if branching_type == BranchingType.BP:
+            expected = expected & (
+                xp.abs(index_arrays[get_child(c.G, node, "cos")]) <= index_arrays[node]
+            )
+        if branching_type == BranchingType.C:
+            value = (
+                index_arrays[node]
+                - xp.abs(index_arrays[get_child(c.G, node, "sin")])
+                - xp.abs(index_arrays[get_child(c.G, node, "cos")])
+            )
+            has_negative = has_negative or bool(xp.any(value < 0))
+            expected = expected & (value % 2 == 0) & (value >= 0)
+    assert has_negative
+    actual = flatten_mask_harmonics(
+        c, n_end=n_end, include_negative_m=include_negative_m, xp=xp, device=device
+    )
+    assert xp.all(actual == expected)
@@ -8,13 +8,19 @@ from array_api_compat import to_device
 from scipy.special import sph_harm_y_all
 from ultrasphere import (
     SphericalCoordinates,
+    create_from_branching_types,
     create_hopf,
+    create_polar,
     create_spherical,
     create_standard,
     integrate,
 )
 
 from ultrasphere_harmonics._core import Phase, harmonics
+from ultrasphere_harmonics._core._concat import (
+    _concat_flatten_harmonics,
+    concat_harmonics,
+)
 from ultrasphere_harmonics._core._flatten import flatten_harmonics
 from ultrasphere_harmonics._ndim import harm_n_ndim_le
 
@@ -93,3 +99,59 @@ def test_match_scipy(
         flatten=True,
     )
     assert xp.all(xpx.isclose(actual, expected, rtol=1e-3, atol=1e-3))
+
+
+@pytest.mark.parametrize(
+    "c",
+    [
+        (create_spherical()),
+        (create_standard(3)),
+        (create_hopf(2)),
+    ],
+)
+@pytest.mark.parametrize("phase", Phase.all())
+def test_harmonics_float32[TSpherical, TCartesian](
+    c: SphericalCoordinates[TSpherical, TCartesian],
+    phase: Phase,
+    xp: ArrayNamespaceFull,
+    device: Any,
+) -> None:
+    x = xp.random.random_uniform(
+        low=-1, high=1, shape=(c.c_ndim, 5), device=device, dtype=xp.float64
+    )
+    x_spherical = c.from_cartesian(x)
+    expected = harmonics(c, x_spherical, n_end=5, phase=phase)
+    actual = harmonics(
+        c,
+        {k: xp.astype(v, xp.float32) for k, v in x_spherical.items()},
+        n_end=5,
+        phase=phase,
+    )
+    assert actual.dtype == xp.complex64
+    assert xp.all(
+        xpx.isclose(actual, xp.astype(expected, xp.complex64), rtol=1e-4, atol=1e-4)
+    )
+
+
+def test_concat_flatten_harmonics_no_spherical_nodes() -> None:
+    c = create_from_branching_types("")
+    with pytest.raises(ValueError, match="without spherical nodes"):
+        _concat_flatten_harmonics(c, {}, n_end=2, include_negative_m=True)
+
+
+def test_concat_harmonics_single_factor_copies(
+    xp: ArrayNamespaceFull, device: Any
+) -> None:
+    c = create_polar()
+    harm = harmonics(
+        c,
+        {"phi": xp.asarray([0.5, 1.0], device=device)},
+        n_end=2,
+        phase=Phase(0),
+        concat=False,
+    )
+    expected = xp.asarray(harm["phi"], copy=True)
+    result = concat_harmonics(c, harm)
+    assert xp.all(result == expected)
+    result[...] = 0
+    assert xp.all(harm["phi"] == expected)
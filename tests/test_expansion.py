@@ -12,6 +12,7 @@ from ultrasphere import (
     SphericalCoordinates,
     create_from_branching_types,
     create_hopf,
+    create_polar,
     create_spherical,
     create_standard,
     roots,
@@ -166,3 +167,91 @@ def test_approximate[TSpherical, TCartesian](
         ax.set_yscale("log")
         fig.savefig(PATH / f"{name}-approximate.png")
     assert error[max(error.keys())] < 5e-3
+
+
+def test_expand_evaluate_mapping(xp: ArrayNamespaceFull, device: Any) -> None:
+    c = create_polar()
+
+    def f(s: Mapping[str, Array]) -> Mapping[str, Array]:
+        return {"phi": xp.exp(2j * s["phi"]) / (2 * np.pi) ** 0.5}
+
+    expansion = expand(
+        c,
+        f,
+        does_f_support_separation_of_variables=True,
+        n_end=4,
+        n=8,
+        phase=Phase(0),
+        xp=xp,
+        device=device,
+    )
+    spherical = {"phi": xp.linspace(0, 6, 5, device=device)}
+    actual = expand_evaluate(c, expansion, spherical, phase=Phase(0))
+    assert xp.all(xpx.isclose(actual["phi"], f(spherical)["phi"], atol=1e-6))
+
+
+def test_expand_float32(xp: ArrayNamespaceFull, device: Any) -> None:
+    c = create_spherical()
+
+    def f(s: Mapping[str, Array]) -> Array:
+        return xp.sin(s["theta"]) * xp.sin(s["phi"])
+
+    expansions = {
+        dtype: expand(
+            c,
+            f,
+            does_f_support_separation_of_variables=False,
+            n_end=3,
+            n=4,
+            phase=Phase(0),
+            xp=xp,
+            device=device,
+            dtype=dtype,
+        )
+        for dtype in (xp.float32, xp.float64)
+    }
+    assert expansions[xp.float32].dtype == xp.complex64
+    assert xp.all(
+        xpx.isclose(
+            xp.astype(expansions[xp.float32], xp.complex128),
+            expansions[xp.float64],
+            atol=1e-5,
+        )
+    )
+
+
+@pytest.mark.parametrize("concat", [True, False])
+def test_expand_harmonics_roots(
+    concat: bool, xp: ArrayNamespaceFull, device: Any
+) -> None:
+    c = create_spherical()
+    n_end, n = 3, 4
+
+    def f(s: Mapping[str, Array]) -> Mapping[str, Array] | Array:
+        if concat:
+            return xp.sin(s["theta"]) * xp.sin(s["phi"])
+        return {"theta": xp.sin(s["theta"]), "phi": xp.sin(s["phi"])}
+
+    xs, _ = roots(c, n, device=device, expand_dims_x=concat, xp=xp)
+    harmonics_roots = harmonics(  # type: ignore[call-overload]
+        c, xs, n_end=n_end, phase=Phase(0), expand_dims=concat, concat=concat
+    )
+    expected, actual = (
+        expand(  # type: ignore[call-overload]
+            c,
+            f,
+            does_f_support_separation_of_variables=not concat,
+            n_end=n_end,
+            n=n,
+            phase=Phase(0),
+            xp=xp,
+            device=device,
+            harmonics_roots=harmonics_roots_,
+        )
+        for harmonics_roots_ in (None, harmonics_roots)
+    )
+    if concat:
+        assert xp.all(xpx.isclose(actual, expected))
+    else:
+        for node in c.s_nodes:
+            assert xp.all(xpx.isclose(actual[node], expected[node]))
@@ -1,4 +1,15 @@
-from ultrasphere_harmonics._ndim import harm_n_ndim_le
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+import pytest
+
+from ultrasphere_harmonics._ndim import (
+    harm_n_ndim_eq,
+    harm_n_ndim_le,
+    homogeneous_ndim_eq,
+    homogeneous_ndim_le,
+)
 
 
 def test_harm_n_ndim_le() -> None:
@@ -18,3 +29,14 @@ def test_harm_n_ndim_le() -> None:
     assert harm_n_ndim_le(1, c_ndim=3) == 1
     assert harm_n_ndim_le(2, c_ndim=3) == 4
     assert harm_n_ndim_le(3, c_ndim=3) == 9
+
+
+@pytest.mark.parametrize(
+    "func", [homogeneous_ndim_eq, homogeneous_ndim_le, harm_n_ndim_eq, harm_n_ndim_le]
+)
+@pytest.mark.parametrize("c_ndim", [1, 2, 3, 4, 5])
+def test_ndim_int_array_agree(func: Callable[..., Any], c_ndim: int) -> None:
+    n = list(range(-3, 6))
+    expected = [int(func(n_, c_ndim=c_ndim)) for n_ in n]
+    actual = func(np.asarray(n), c_ndim=c_ndim)
+    assert actual.tolist() == expected